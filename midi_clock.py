@@ -4,11 +4,16 @@ Raspberry Pi MIDI Clock Master
 Controls MIDI clock via Sense HAT joystick and displays BPM on LED matrix.
 """
 
+import os
 import time
+import ctypes
+import errno
+import gc
+import mmap
 import threading
 import sys
 import termios
-import tty
+import numpy as np
 from sense_hat import SenseHat
 import rtmidi
 
@@ -37,25 +42,201 @@ MIDI_START = 0xFA
 MIDI_STOP = 0xFC
 PPQN = 24  # Pulses Per Quarter Note (standard MIDI clock resolution)
 
+# Pre-encoded single-byte messages, shared by every send
+MSG_CLOCK = bytes((MIDI_CLOCK,))
+MSG_START = bytes((MIDI_START,))
+MSG_STOP = bytes((MIDI_STOP,))
+
+# BPM change per joystick direction (repeats while held)
+JOYSTICK_BPM_STEPS = {
+    'up': 1.0,
+    'down': -1.0,
+    'right': 0.1,  # Fine increase
+    'left': -0.1,  # Fine decrease
+}
+
+# Real-time tuning
+CLOCK_THREAD_PRIORITY = 80  # SCHED_FIFO priority for the clock thread (needs CAP_SYS_NICE)
+DEFAULT_CLOCK_CPU = 3  # CPU core the clock thread is pinned to (override with CLOCK_CPU, -1 disables)
+GC_THRESHOLDS = (100000, 100, 100)  # Rare, short garbage collections (see freeze_gc)
+MCL_CURRENT = 1  # mlockall() flags from <sys/mman.h>
+MCL_FUTURE = 2
+CLOCK_MONOTONIC = 1  # clock_nanosleep() arguments from <time.h>
+TIMER_ABSTIME = 1
+
+try:
+    _libc = ctypes.CDLL("libc.so.6", use_errno=True)
+    _clock_nanosleep = _libc.clock_nanosleep
+except (OSError, AttributeError):
+    # Not glibc (or not Linux): fall back to plain Python sleeps
+    _libc = None
+    _clock_nanosleep = None
+
+class _Timespec(ctypes.Structure):
+    _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+def sleep_until(deadline):
+    """Sleep until an absolute time.monotonic() deadline.
+    
+    Uses clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME) so the kernel wakes
+    the thread at the deadline itself, rather than after a relative delay
+    computed (and possibly preempted) in Python. ctypes releases the GIL for
+    the duration of the call.
+    """
+    if _clock_nanosleep is None:
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+        return
+    
+    sec = int(deadline)
+    ts = _Timespec(sec, int((deadline - sec) * 1e9))
+    # An absolute sleep can simply be restarted when interrupted by a signal
+    while _clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, ctypes.byref(ts), None) == errno.EINTR:
+        pass
+
+# LED matrix fonts (1 = lit pixel)
+# Compact 2x5 font for 3-digit numbers (taller and more readable)
+DIGITS_SMALL = {
+    '0': [[1,1], [1,1], [1,1], [1,1], [1,1]],
+    '1': [[0,1], [1,1], [0,1], [0,1], [1,1]],
+    '2': [[1,1], [0,1], [1,1], [1,0], [1,1]],
+    '3': [[1,1], [0,1], [1,1], [0,1], [1,1]],
+    '4': [[1,1], [1,1], [1,1], [0,1], [0,1]],
+    '5': [[1,1], [1,0], [1,1], [0,1], [1,1]],
+    '6': [[1,1], [1,0], [1,1], [1,1], [1,1]],
+    '7': [[1,1], [0,1], [0,1], [0,1], [0,1]],
+    '8': [[1,1], [1,1], [1,1], [1,1], [1,1]],
+    '9': [[1,1], [1,1], [1,1], [0,1], [1,1]]
+}
+
+# Standard 3x5 font for 1-2 digit numbers
+DIGITS_BIG = {
+    '0': [
+        [1,1,1],
+        [1,0,1],
+        [1,0,1],
+        [1,0,1],
+        [1,1,1]
+    ],
+    '1': [
+        [0,1,0],
+        [1,1,0],
+        [0,1,0],
+        [0,1,0],
+        [1,1,1]
+    ],
+    '2': [
+        [1,1,1],
+        [0,0,1],
+        [1,1,1],
+        [1,0,0],
+        [1,1,1]
+    ],
+    '3': [
+        [1,1,1],
+        [0,0,1],
+        [1,1,1],
+        [0,0,1],
+        [1,1,1]
+    ],
+    '4': [
+        [1,0,1],
+        [1,0,1],
+        [1,1,1],
+        [0,0,1],
+        [0,0,1]
+    ],
+    '5': [
+        [1,1,1],
+        [1,0,0],
+        [1,1,1],
+        [0,0,1],
+        [1,1,1]
+    ],
+    '6': [
+        [1,1,1],
+        [1,0,0],
+        [1,1,1],
+        [1,0,1],
+        [1,1,1]
+    ],
+    '7': [
+        [1,1,1],
+        [0,0,1],
+        [0,0,1],
+        [0,0,1],
+        [0,0,1]
+    ],
+    '8': [
+        [1,1,1],
+        [1,0,1],
+        [1,1,1],
+        [1,0,1],
+        [1,1,1]
+    ],
+    '9': [
+        [1,1,1],
+        [1,0,1],
+        [1,1,1],
+        [0,0,1],
+        [1,1,1]
+    ]
+}
+
+def _glyph_indices(font):
+    """Precompute the flat pixel indices (row * 8 + column) lit by each glyph."""
+    return {
+        digit: np.array([y * 8 + x for y, row in enumerate(pattern) for x, lit in enumerate(row) if lit], dtype=np.intp)
+        for digit, pattern in font.items()
+    }
+
+# Built once at import time so drawing a digit is a single indexed assignment
+GLYPHS_SMALL = _glyph_indices(DIGITS_SMALL)
+GLYPHS_BIG = _glyph_indices(DIGITS_BIG)
+
+# Digit x positions used by _render_frame, keyed by number of digits.
+# 1-2 digits use the 3x5 font, 3 digits the compact 2x5 font.
+DIGIT_X_OFFSETS = {
+    1: (2,),  # Centered
+    2: (0, 4),
+    3: (0, 3, 6),  # 2 wide with 1 pixel spacing
+}
+
+def _check_glyph_bounds(font, x_offsets, y_offset=0):
+    """Make sure every glyph fits on the 8x8 matrix at the given offsets.
+    
+    Flat pixel indices don't clip: a glyph past the right edge would wrap
+    into the next row. Checking once here replaces per-pixel bounds checks.
+    """
+    for digit, pattern in font.items():
+        height, width = len(pattern), len(pattern[0])
+        for x_offset in x_offsets:
+            if x_offset < 0 or x_offset + width > 8 or y_offset < 0 or y_offset + height > 8:
+                raise ValueError(f"Digit '{digit}' at ({x_offset}, {y_offset}) does not fit on the LED matrix")
+
+_check_glyph_bounds(DIGITS_BIG, DIGIT_X_OFFSETS[1] + DIGIT_X_OFFSETS[2])
+_check_glyph_bounds(DIGITS_SMALL, DIGIT_X_OFFSETS[3])
+
 class MIDIClock:
     def __init__(self, midi_port=None):
         # Disable terminal echo to prevent escape sequences from showing
         try:
-            # Save terminal settings
-            self.old_settings = termios.tcgetattr(sys.stdin)
-            # Disable echo and set raw mode
-            tty.setraw(sys.stdin.fileno())
-            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self.old_settings)
-            # Disable echo specifically
-            new_settings = termios.tcgetattr(sys.stdin)
-            new_settings[3] = new_settings[3] & ~termios.ECHO
-            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, new_settings)
+            fd = sys.stdin.fileno()
+            attrs = termios.tcgetattr(fd)
+            # Save terminal settings (copy, since we modify attrs below)
+            self.old_settings = attrs[:]
+            # Disable echo and line buffering in a single update
+            attrs[3] &= ~(termios.ECHO | termios.ICANON)
+            termios.tcsetattr(fd, termios.TCSADRAIN, attrs)
         except (AttributeError, OSError, termios.error):
             # If stdin is not a TTY, ignore
             self.old_settings = None
         
         self.sense = SenseHat()
         self.sense.clear()
+        # Direct framebuffer access for LED updates (None = use set_pixels)
+        self._fb_map = self.open_framebuffer()
         
         # Initialize MIDI output - support multiple ports
         temp_midiout = rtmidi.MidiOut()
@@ -103,7 +284,9 @@ class MIDIClock:
         else:
             # Use specified port(s) - can be a single port or list
             if isinstance(midi_port, (list, tuple)):
-                port_list = midi_port
+                # Drop duplicates: opening the same port twice would send
+                # every clock pulse to it twice (doubling the tempo)
+                port_list = list(dict.fromkeys(midi_port))
             else:
                 port_list = [midi_port]
             
@@ -122,30 +305,98 @@ class MIDIClock:
         # Keep single midiout for backward compatibility (use first port)
         self.midiout = self.midiout_ports[0][0] if self.midiout_ports else None
         
+        # Hot-path view of the open ports for the clock thread: pre-bound
+        # send methods, so each pulse skips the attribute lookup (ports are
+        # validated when opened, so the pulse loop sends without try/except)
+        self._senders = tuple(midiout.send_message for midiout, _ in self.midiout_ports)
+        self._sender_ports = {send: port_name for send, (_, port_name) in zip(self._senders, self.midiout_ports)}
+        
         # Clock state
         self.bpm = 120.0
+        self._interval = self.calculate_clock_interval(self.bpm)  # Seconds between pulses, updated by set_bpm
         self.running = False
         self.clock_thread = None
         self.stop_event = threading.Event()
+        # Orders clock pulses against START/STOP so no pulse follows a STOP
+        self.transport_lock = threading.Lock()
         
-        # Display update
-        self.display_thread = None
-        self.display_stop_event = threading.Event()
+        # Display update: redrawn by whichever thread changes what is shown
+        self.display_lock = threading.Lock()
+        # Preallocated LED frame, reused for every redraw
+        self._frame = np.zeros((8, 8, 3), dtype=np.uint8)
+        self._last_frame = None  # bytes of the last frame sent to the LED matrix
+        self._display_dirty = False  # Redraw requested while another thread was drawing
         
         # Beat ramp state - synced to MIDI clock pulses
         self.beat_position = 0  # 0-3 (4 positions: x=0, 2, 4, 6)
         self.clock_pulse_count = 0  # Count MIDI clock pulses (24 per beat)
         
         # Joystick state
-        self.last_joystick_time = 0
+        self.last_joystick_time = 0  # time.monotonic() of the last accepted event
         self.joystick_debounce = 0.1  # 100ms debounce
-        self.held_direction = None  # Track which direction is being held
-        self.repeat_thread = None  # Thread for repeating BPM changes
-        self.repeat_stop_event = threading.Event()
+        # (direction, signed BPM step) while a direction is held, else None.
+        # Always replaced as a whole so the worker never sees a torn update.
+        self.held = None
+        self.repeat_event = threading.Event()  # Set when a repeating direction is pressed
+        self.release_event = threading.Event()  # Set when the joystick is released
+        
+        # Show the initial BPM
+        self.update_display()
+        
+        # Single long-lived worker for repeating BPM changes while held
+        self.repeat_thread = threading.Thread(target=self._repeat_worker, daemon=True)
+        self.repeat_thread.start()
+        
+        # Move everything allocated during startup out of the collector's way
+        self.freeze_gc()
+        
+        # Keep all pages resident so the clock path never waits on swap
+        self.lock_memory()
         
-        # Start display thread
-        self.start_display()
+    def freeze_gc(self):
+        """Reduce garbage collector pauses that would land on the clock thread.
         
+        Startup objects are moved to the permanent generation (gc.freeze) so
+        later collections don't scan them, and gen-0 collections are made
+        rare. The runtime paths allocate little and create no reference
+        cycles, so very little garbage builds up between collections.
+        """
+        gc.collect()
+        if hasattr(gc, 'freeze'):  # Python 3.7+
+            gc.freeze()
+        gc.set_threshold(*GC_THRESHOLDS)
+    
+    def lock_memory(self):
+        """Lock current and future memory pages into RAM (mlockall)."""
+        if _libc is None:
+            print(f"{Colors.YELLOW}⚠ Could not lock memory: libc not available{Colors.RESET}")
+            return
+        if _libc.mlockall(MCL_CURRENT | MCL_FUTURE) != 0:
+            print(f"{Colors.YELLOW}⚠ Could not lock memory: {os.strerror(ctypes.get_errno())}{Colors.RESET}")
+    
+    def set_realtime_priority(self):
+        """Switch the calling thread to SCHED_FIFO so it preempts the other threads."""
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(CLOCK_THREAD_PRIORITY))
+        except (AttributeError, OSError) as e:
+            # Needs CAP_SYS_NICE (or root); fall back to normal scheduling
+            print(f"{Colors.YELLOW}⚠ Could not set real-time priority for clock thread: {e}{Colors.RESET}")
+    
+    def set_cpu_affinity(self):
+        """Pin the calling thread to one CPU core (ideally isolated with isolcpus)."""
+        try:
+            cpu = int(os.environ.get('CLOCK_CPU', DEFAULT_CLOCK_CPU))
+        except ValueError:
+            print(f"{Colors.YELLOW}⚠ Ignoring invalid CLOCK_CPU={os.environ['CLOCK_CPU']!r}{Colors.RESET}")
+            return
+        # Skip on single/dual-core boards (e.g. Pi Zero) or when disabled
+        if cpu < 0 or cpu >= (os.cpu_count() or 1):
+            return
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except (AttributeError, OSError) as e:
+            print(f"{Colors.YELLOW}⚠ Could not pin clock thread to CPU {cpu}: {e}{Colors.RESET}")
+    
     def calculate_clock_interval(self, bpm):
         """Calculate the time interval between MIDI clock pulses in seconds."""
         # 24 pulses per quarter note
@@ -160,82 +411,154 @@ class MIDIClock:
         (t0 + n * interval), so the wake-up latency of one pulse does not
         accumulate into the next one.
         """
-        last_bpm = self.bpm
-        interval = self.calculate_clock_interval(last_bpm)
-        next_deadline = time.monotonic()
-        
-        while not self.stop_event.is_set():
+        self.set_cpu_affinity()
+        self.set_realtime_priority()
+        
+        # Bind the loop's callables to locals so each pulse skips the
+        # attribute and global lookups (state shared with other threads,
+        # like running and bpm, is still read from self)
+        senders = self._senders
+        clock_msg = MSG_CLOCK
+        transport_lock = self.transport_lock
+        stop_is_set = self.stop_event.is_set
+        monotonic = time.monotonic
+        sleep = time.sleep
+        wait_until = sleep_until
+        next_deadline = monotonic()
+        send_errors = None
+        
+        while not stop_is_set():
             if not self.running:
-                # Keep the deadline aligned with "now" while stopped
-                next_deadline = time.monotonic()
-                time.sleep(0.01)
+                # Keep the deadline aligned with "now" while stopped, so the
+                # first interval after a start is not cut short
+                sleep(0.01)
+                next_deadline = monotonic()
                 continue
             
-            # Only recompute the interval when the tempo actually changed
-            if self.bpm != last_bpm:
-                last_bpm = self.bpm
-                interval = self.calculate_clock_interval(last_bpm)
-            
+            # Precomputed by set_bpm, so tempo changes apply from the next pulse
+            interval = self._interval
             next_deadline += interval
             
-            # Send clock to all open MIDI ports
-            for midiout, port_name in self.midiout_ports:
-                try:
-                    midiout.send_message([MIDI_CLOCK])
-                except Exception as e:
-                    print(f"{Colors.BRIGHT_RED}⚠ Error sending to {port_name}: {e}{Colors.RESET}")
+            beat_advanced = False
+            with transport_lock:
+                # Stopped since the check above: drop the pending pulse so
+                # no clock is ever sent after MIDI Stop
+                if self.running:
+                    # Send clock to all open MIDI ports. The try costs nothing
+                    # per pulse; a failing port is dropped so the others keep
+                    # receiving clock
+                    try:
+                        for send in senders:
+                            send(clock_msg)
+                    except Exception as e:
+                        senders, send_errors = self._drop_failed_sender(senders, send, e, clock_msg)
+                    
+                    # Increment clock pulse counter for beat ramp sync
+                    self.clock_pulse_count += 1
+                    # Every 24 pulses = 1 beat, advance beat ramp
+                    if self.clock_pulse_count >= PPQN:
+                        self.clock_pulse_count = 0
+                        # Advance beat position (0-3, cycles)
+                        self.beat_position = (self.beat_position + 1) % 4
+                        beat_advanced = True
             
-            # Increment clock pulse counter for beat ramp sync
-            self.clock_pulse_count += 1
-            # Every 24 pulses = 1 beat, advance beat ramp
-            if self.clock_pulse_count >= PPQN:
-                self.clock_pulse_count = 0
-                # Advance beat position (0-3, cycles)
-                self.beat_position = (self.beat_position + 1) % 4
+            if send_errors:
+                # Reported outside transport_lock, like START/STOP errors
+                self.report_send_errors(send_errors, "clock")
+                send_errors = None
+                if not senders:
+                    print(f"{Colors.BRIGHT_RED}⚠ No MIDI ports left to send clock to{Colors.RESET}")
+                    self.stop_clock()
+            
+            # The beat ramp only changes on beat boundaries, so redraw here
+            # (after the pulse went out) instead of polling from a thread
+            if beat_advanced:
+                self.update_display(blocking=False)
             
             # Sleep until the next absolute deadline
-            remaining = next_deadline - time.monotonic()
+            remaining = next_deadline - monotonic()
             if remaining > 0:
-                time.sleep(remaining)
+                wait_until(next_deadline)
             elif remaining < -interval:
                 # More than one interval late: resync instead of bursting
-                next_deadline = time.monotonic()
+                next_deadline = monotonic()
+    
+    def _drop_failed_sender(self, senders, failed, error, message):
+        """Remove a port whose clock send raised and finish the pulse on the rest.
+        
+        Returns the remaining senders and a list of (port_name, error) for
+        every port dropped, to be reported once transport_lock is released.
+        """
+        errors = [(self._sender_ports.get(failed, '?'), error)]
+        index = senders.index(failed)
+        remaining = senders[:index] + senders[index + 1:]
+        # Ports before the failed one already got this pulse
+        for send in senders[index + 1:]:
+            try:
+                send(message)
+            except Exception as e:
+                remaining, more_errors = self._drop_failed_sender(remaining, send, e, message)
+                errors.extend(more_errors)
+                break
+        self._senders = remaining
+        return remaining, errors
+    
+    def send_to_all_ports(self, message):
+        """Send a message to all open ports.
+        
+        Returns a list of (port_name, error) for the ports that failed, so
+        callers holding transport_lock can report them after releasing it.
+        """
+        errors = []
+        for midiout, port_name in self.midiout_ports:
+            try:
+                midiout.send_message(message)
+            except Exception as e:
+                errors.append((port_name, e))
+        return errors
+    
+    def report_send_errors(self, errors, label):
+        """Print the per-port errors returned by send_to_all_ports."""
+        for port_name, e in errors:
+            print(f"{Colors.BRIGHT_RED}Error sending {label} to {port_name}: {e}{Colors.RESET}")
     
     def start_clock(self):
         """Start the MIDI clock on all open ports."""
         if not self.running:
-            self.running = True
-            # Reset beat ramp position and clock pulse counter
-            self.beat_position = 0
-            self.clock_pulse_count = 0
-            # Send start message to all open MIDI ports
-            for midiout, port_name in self.midiout_ports:
-                try:
-                    midiout.send_message([MIDI_START])
-                except Exception as e:
-                    print(f"{Colors.BRIGHT_RED}Error sending START to {port_name}: {e}{Colors.RESET}")
+            with self.transport_lock:
+                self.running = True
+                # Reset beat ramp position and clock pulse counter
+                self.beat_position = 0
+                self.clock_pulse_count = 0
+                # Send start message to all open MIDI ports
+                errors = self.send_to_all_ports(MSG_START)
+            # Console output happens outside the lock the clock thread takes
+            self.report_send_errors(errors, "START")
+            self.update_display()
             print(f"\r{Colors.BRIGHT_GREEN}{Colors.BOLD}▶ MIDI clock STARTED at {self.bpm:.1f} BPM{Colors.RESET} ({len(self.midiout_ports)} port(s))        ")
     
     def stop_clock(self):
         """Stop the MIDI clock on all open ports."""
         if self.running:
-            self.running = False
-            # Send stop message to all open MIDI ports
-            for midiout, port_name in self.midiout_ports:
-                try:
-                    midiout.send_message([MIDI_STOP])
-                except Exception as e:
-                    print(f"{Colors.BRIGHT_RED}Error sending STOP to {port_name}: {e}{Colors.RESET}")
+            with self.transport_lock:
+                self.running = False
+                # Send stop message to all open MIDI ports
+                errors = self.send_to_all_ports(MSG_STOP)
+            # Console output happens outside the lock the clock thread takes
+            self.report_send_errors(errors, "STOP")
+            self.update_display()
             print(f"\r{Colors.BRIGHT_RED}{Colors.BOLD}■ MIDI clock STOPPED{Colors.RESET} ({len(self.midiout_ports)} port(s))        ")
     
     def set_bpm(self, bpm):
         """Set the BPM (clamped to reasonable range)."""
         self.bpm = max(20.0, min(300.0, bpm))
+        self._interval = self.calculate_clock_interval(self.bpm)
         # Use carriage return to overwrite line and clear any escape sequences
         # Color based on running state
         color = Colors.BRIGHT_GREEN if self.running else Colors.BRIGHT_RED
         status = "▶ RUNNING" if self.running else "■ STOPPED"
         print(f"\r{color}{Colors.BOLD}BPM: {self.bpm:.1f} {status}{Colors.RESET}        ", end='', flush=True)
+        self.update_display()
     
     def increase_bpm(self, step=1.0):
         """Increase BPM by step amount."""
@@ -245,119 +568,25 @@ class MIDIClock:
         """Decrease BPM by step amount."""
         self.set_bpm(self.bpm - step)
     
-    def draw_digit(self, pixels, digit, x_offset, y_offset, color, small=False):
-        """Draw a single digit on the LED matrix pixel array.
+    def draw_digit(self, frame, digit, x_offset, y_offset, color, small=False):
+        """Draw a single digit on the LED matrix frame.
+        
+        Offsets are not bounds-checked here: the positions _render_frame
+        uses (DIGIT_X_OFFSETS) are validated once at import time.
         
         Args:
-            pixels: 64-element list of RGB tuples
+            frame: 8x8x3 uint8 numpy array
             digit: digit character to draw
             x_offset: x position (0-7)
             y_offset: y position (0-7)
             color: RGB tuple
             small: if True, use 2x5 font, else use 3x5 font
         """
-        if small:
-            # Compact 2x5 font for 3-digit numbers (taller and more readable)
-            digits = {
-                '0': [[1,1], [1,1], [1,1], [1,1], [1,1]],
-                '1': [[0,1], [1,1], [0,1], [0,1], [1,1]],
-                '2': [[1,1], [0,1], [1,1], [1,0], [1,1]],
-                '3': [[1,1], [0,1], [1,1], [0,1], [1,1]],
-                '4': [[1,1], [1,1], [1,1], [0,1], [0,1]],
-                '5': [[1,1], [1,0], [1,1], [0,1], [1,1]],
-                '6': [[1,1], [1,0], [1,1], [1,1], [1,1]],
-                '7': [[1,1], [0,1], [0,1], [0,1], [0,1]],
-                '8': [[1,1], [1,1], [1,1], [1,1], [1,1]],
-                '9': [[1,1], [1,1], [1,1], [0,1], [1,1]]
-            }
-            pattern = digits.get(str(digit), digits['0'])
-            height, width = 5, 2
-        else:
-            # Standard 3x5 font for 1-2 digit numbers
-            digits = {
-                '0': [
-                    [1,1,1],
-                    [1,0,1],
-                    [1,0,1],
-                    [1,0,1],
-                    [1,1,1]
-                ],
-                '1': [
-                    [0,1,0],
-                    [1,1,0],
-                    [0,1,0],
-                    [0,1,0],
-                    [1,1,1]
-                ],
-                '2': [
-                    [1,1,1],
-                    [0,0,1],
-                    [1,1,1],
-                    [1,0,0],
-                    [1,1,1]
-                ],
-                '3': [
-                    [1,1,1],
-                    [0,0,1],
-                    [1,1,1],
-                    [0,0,1],
-                    [1,1,1]
-                ],
-                '4': [
-                    [1,0,1],
-                    [1,0,1],
-                    [1,1,1],
-                    [0,0,1],
-                    [0,0,1]
-                ],
-                '5': [
-                    [1,1,1],
-                    [1,0,0],
-                    [1,1,1],
-                    [0,0,1],
-                    [1,1,1]
-                ],
-                '6': [
-                    [1,1,1],
-                    [1,0,0],
-                    [1,1,1],
-                    [1,0,1],
-                    [1,1,1]
-                ],
-                '7': [
-                    [1,1,1],
-                    [0,0,1],
-                    [0,0,1],
-                    [0,0,1],
-                    [0,0,1]
-                ],
-                '8': [
-                    [1,1,1],
-                    [1,0,1],
-                    [1,1,1],
-                    [1,0,1],
-                    [1,1,1]
-                ],
-                '9': [
-                    [1,1,1],
-                    [1,0,1],
-                    [1,1,1],
-                    [0,0,1],
-                    [1,1,1]
-                ]
-            }
-            pattern = digits.get(str(digit), digits['0'])
-            height, width = 5, 3
-        
-        for y in range(height):
-            for x in range(width):
-                if pattern[y][x]:
-                    # Calculate pixel index: row * 8 + column
-                    idx = (y + y_offset) * 8 + (x + x_offset)
-                    if 0 <= idx < 64:
-                        pixels[idx] = color
+        glyphs = GLYPHS_SMALL if small else GLYPHS_BIG
+        indices = glyphs.get(digit, glyphs['0'])
+        frame.reshape(64, 3)[indices + (y_offset * 8 + x_offset)] = color
     
-    def draw_beat_ramp(self, pixels):
+    def draw_beat_ramp(self, frame):
         """Draw a 2x2 white box in the beat ramp (rows 6-7) with dimmed trail.
         
         The beat position is updated by the MIDI clock thread, so it's
@@ -368,142 +597,171 @@ class MIDIClock:
         - Previous beats: 50% white (dimmed)
         
         Args:
-            pixels: 64-element list of RGB tuples
+            frame: 8x8x3 uint8 numpy array
         """
         if not self.running:
             # Don't show ramp when stopped
             return
         
-        # Colors: white (100%) and dimmed white (50%)
-        white = (255, 255, 255)
-        dimmed_white = (127, 127, 127)  # 50% brightness
+        # Read once: the clock thread may advance it while we draw
+        beat_position = self.beat_position
+        x_end = beat_position * 2  # x positions: 0, 2, 4, 6
         
-        # Draw all 4 boxes (positions 0, 2, 4, 6)
-        for box_num in range(4):
-            x_pos = box_num * 2  # x positions: 0, 2, 4, 6
-            
-            # Current beat is white, previous beats are dimmed
-            if box_num == self.beat_position:
-                color = white  # Current beat: full brightness
-            elif box_num < self.beat_position:
-                color = dimmed_white  # Previous beats: 50% brightness
-            else:
-                # Future beats (shouldn't happen in normal flow, but handle it)
-                continue
-            
-            # Draw 2x2 box at this position (rows 6-7)
-            for y in range(2):  # rows 6-7
-                for x in range(2):  # 2 pixels wide
-                    idx = (y + 6) * 8 + (x + x_pos)
-                    if 0 <= idx < 64:
-                        pixels[idx] = color
+        # Previous beats: 50% brightness, current beat: full brightness
+        frame[6:8, 0:x_end] = (127, 127, 127)
+        frame[6:8, x_end:x_end + 2] = (255, 255, 255)
+    
+    def _render_frame(self):
+        """Render BPM digits and beat ramp into the shared frame and return it."""
+        frame = self._frame
+        # Clear the frame in place (no per-frame allocation)
+        frame.fill(0)
+        bpm_str = f"{int(self.bpm)}"
+        
+        # Choose color: green if running, red if stopped
+        color = (0, 255, 0) if self.running else (255, 0, 0)
+        
+        # Display BPM number statically (rows 0-4); 3 digits use the
+        # compact 2x5 font (more readable), fewer use the 3x5 font
+        small = len(bpm_str) == 3
+        for digit, x_offset in zip(bpm_str, DIGIT_X_OFFSETS[len(bpm_str)]):
+            self.draw_digit(frame, digit, x_offset, 0, color, small=small)
+        
+        # Draw beat ramp (rows 6-7)
+        self.draw_beat_ramp(frame)
+        return frame
     
-    def display_bpm(self):
-        """Display BPM statically on the LED matrix with beat ramp."""
-        last_bpm = -1
-        last_running = None
+    def open_framebuffer(self):
+        """Memory-map the Sense HAT LED framebuffer for direct RGB565 writes.
         
-        while not self.display_stop_event.is_set():
-            current_bpm = int(self.bpm)
-            
-            # Update display if BPM or running state changed, or for beat ramp updates
-            if current_bpm != last_bpm or self.running != last_running:
-                # Initialize pixel array (64 pixels, all black)
-                pixels = [(0, 0, 0)] * 64
-                bpm_str = f"{current_bpm}"
-                
-                # Choose color: green if running, red if stopped
-                color = (0, 255, 0) if self.running else (255, 0, 0)
-                
-                # Display BPM number statically (rows 0-4)
-                if len(bpm_str) == 1:
-                    # Center single digit with 3x5 font (starts at row 0)
-                    self.draw_digit(pixels, bpm_str[0], 2, 0, color, small=False)
-                elif len(bpm_str) == 2:
-                    # Two digits side by side with 3x5 font (starts at row 0)
-                    self.draw_digit(pixels, bpm_str[0], 0, 0, color, small=False)
-                    self.draw_digit(pixels, bpm_str[1], 4, 0, color, small=False)
-                else:  # 3 digits - use compact 2x5 font (more readable)
-                    # 2x5 font: each digit is 2 wide, with 1 pixel spacing
-                    # Positions: 0, 3, 6 (fits in 8 pixels width, starts at row 0)
-                    self.draw_digit(pixels, bpm_str[0], 0, 0, color, small=True)
-                    self.draw_digit(pixels, bpm_str[1], 3, 0, color, small=True)
-                    self.draw_digit(pixels, bpm_str[2], 6, 0, color, small=True)
-                
-                # Draw beat ramp (rows 6-7)
-                self.draw_beat_ramp(pixels)
-                
-                # Update the display
-                self.sense.set_pixels(pixels)
-                
-                last_bpm = current_bpm
-                last_running = self.running
-            else:
-                # Even if BPM/running state hasn't changed, update beat ramp
-                pixels = [(0, 0, 0)] * 64
-                bpm_str = f"{current_bpm}"
-                color = (0, 255, 0) if self.running else (255, 0, 0)
-                
-                # Redraw BPM digits
-                if len(bpm_str) == 1:
-                    self.draw_digit(pixels, bpm_str[0], 2, 0, color, small=False)
-                elif len(bpm_str) == 2:
-                    self.draw_digit(pixels, bpm_str[0], 0, 0, color, small=False)
-                    self.draw_digit(pixels, bpm_str[1], 4, 0, color, small=False)
-                else:
-                    self.draw_digit(pixels, bpm_str[0], 0, 0, color, small=True)
-                    self.draw_digit(pixels, bpm_str[1], 3, 0, color, small=True)
-                    self.draw_digit(pixels, bpm_str[2], 6, 0, color, small=True)
-                
-                # Update beat ramp
-                self.draw_beat_ramp(pixels)
-                self.sense.set_pixels(pixels)
-            
-            # Brief pause before checking for updates
-            time.sleep(0.05)  # Faster update for smoother beat ramp
+        Returns None if the framebuffer can't be found or mapped (or the
+        display is rotated), in which case frames go through
+        sense.set_pixels instead.
+        """
+        if getattr(self.sense, 'rotation', 0) != 0:
+            return None
+        # Use the device sense_hat matched by name ("RPi-Sense FB", usually
+        # /dev/fb1), never a guessed path that could be another display
+        fb_device = getattr(self.sense, '_fb_device', None)
+        if not fb_device:
+            return None
+        try:
+            fd = os.open(fb_device, os.O_RDWR)
+        except OSError:
+            return None
+        try:
+            # 8x8 pixels, 16 bits each
+            return mmap.mmap(fd, 128)
+        except (OSError, ValueError):
+            return None
+        finally:
+            # The mapping keeps its own reference to the device
+            os.close(fd)
     
-    def start_display(self):
-        """Start the display update thread."""
-        if self.display_thread is None or not self.display_thread.is_alive():
-            self.display_stop_event.clear()
-            self.display_thread = threading.Thread(target=self.display_bpm, daemon=True)
-            self.display_thread.start()
+    def show_frame(self, frame):
+        """Push a rendered 8x8x3 frame to the LED matrix."""
+        if self._fb_map is None:
+            # sense_hat expects a flat list of 64 RGB values
+            self.sense.set_pixels(frame.reshape(-1, 3).tolist())
+            return
+        
+        # Same RGB565 packing as sense_hat, done for all 64 pixels at once
+        rgb = frame.astype(np.uint16)
+        rgb565 = ((rgb[..., 0] >> 3) << 11) | ((rgb[..., 1] >> 2) << 5) | (rgb[..., 2] >> 3)
+        self._fb_map[:] = rgb565.tobytes()
     
-    def _repeat_bpm_change(self, direction, step):
-        """Repeatedly change BPM while joystick is held.
+    def update_display(self, blocking=True):
+        """Redraw the LED matrix if the BPM, running state or beat changed.
         
-        Continues until a different direction is pressed or stop event is set.
+        Called from the clock thread on beat boundaries and from the
+        joystick handlers on BPM and start/stop changes.
         
         Args:
-            direction: 'up' or 'down'
-            step: Amount to change BPM by
+            blocking: if False and another thread is drawing, don't wait
+                for it; mark the display dirty so that thread redraws
+                once more before it finishes (used by the clock thread,
+                which must never wait on lower-priority threads)
         """
-        # Initial delay to avoid accidental rapid changes
-        time.sleep(0.3)
-        
-        # Then repeat with shorter interval until stopped
-        while not self.repeat_stop_event.is_set() and self.held_direction == direction:
-            if direction == 'up':
-                self.increase_bpm(step)
-            else:  # down
-                self.decrease_bpm(step)
-            time.sleep(0.15)  # Repeat every 150ms
+        while True:
+            # Request the redraw before trying the lock: whichever thread
+            # holds it clears the flag under the lock and re-checks it after
+            # releasing, so the request can't slip between the two
+            self._display_dirty = True
+            if not self.display_lock.acquire(blocking=blocking):
+                return
+            try:
+                self._display_dirty = False
+                frame = self._render_frame()
+                
+                # Only push to the LED matrix when the picture actually changed
+                frame_bytes = frame.tobytes()
+                if frame_bytes != self._last_frame:
+                    self.show_frame(frame)
+                    self._last_frame = frame_bytes
+            finally:
+                self.display_lock.release()
+            
+            # Checked after releasing, so a request that arrived while we
+            # held the lock is never lost
+            if not self._display_dirty:
+                return
+    
+    def _repeat_worker(self):
+        """Repeatedly change BPM while joystick is held.
+        
+        Runs for the lifetime of the app: blocks on repeat_event until a
+        direction is pressed, then steps the BPM until release_event is set.
+        Waiting on the events (instead of sleeping and polling) means a
+        release stops the repeat immediately.
+        """
+        while not self.stop_event.is_set():
+            self.repeat_event.wait()
+            self.repeat_event.clear()
+            
+            # Initial delay to avoid accidental rapid changes,
+            # then repeat every 150ms until released
+            delay = 0.3
+            while not self.release_event.wait(delay):
+                if self.repeat_event.is_set() or self.stop_event.is_set():
+                    # A new direction was pressed (or shutting down): start over
+                    break
+                held = self.held
+                if held is None:
+                    break
+                self.set_bpm(self.bpm + held[1])
+                delay = 0.15
+    
+    def _start_repeat(self, direction, step):
+        """Apply a BPM step now and hand the held direction to the repeat worker."""
+        held = self.held
+        if held is not None and held[0] == direction:
+            # Already repeating this direction, keep going
+            return
+        
+        # Immediate change, then let the worker repeat it
+        self.set_bpm(self.bpm + step)
+        self.held = (direction, step)
+        self.release_event.clear()
+        self.repeat_event.set()
+    
+    def _stop_repeat(self):
+        """Stop any repeating BPM change."""
+        self.held = None
+        self.release_event.set()
     
     def handle_joystick(self, event):
         """Handle joystick events with repeat functionality."""
         # Stop repeating adjustment only when the stick is released
         if event.action == 'released':
-            self.held_direction = None
-            self.repeat_stop_event.set()
-            if self.repeat_thread and self.repeat_thread.is_alive():
-                self.repeat_thread.join(timeout=0.2)
+            self._stop_repeat()
             return
         
         # Only care about press or hold; ignore anything else
         if event.action not in ('pressed', 'held'):
             return
 
-        current_time = time.time()
+        # Monotonic: an NTP step of the wall clock must not block presses
+        current_time = time.monotonic()
         
         # Debounce only the initial press to avoid double-triggers
         if event.action == 'pressed' and current_time - self.last_joystick_time < self.joystick_debounce:
@@ -511,75 +769,18 @@ class MIDIClock:
         
         self.last_joystick_time = current_time
         
-        if event.direction == 'up':
-            # If already repeating up, keep going
-            if self.held_direction == 'up' and self.repeat_thread and self.repeat_thread.is_alive():
-                return
-            
-            # Stop any existing repeat
-            self.held_direction = None
-            self.repeat_stop_event.set()
-            if self.repeat_thread and self.repeat_thread.is_alive():
-                self.repeat_thread.join(timeout=0.1)
-            
-            # Immediate change
-            self.increase_bpm(1.0)
-            
-            # Start repeat thread
-            self.held_direction = 'up'
-            self.repeat_stop_event.clear()
-            self.repeat_thread = threading.Thread(target=self._repeat_bpm_change, args=('up', 1.0), daemon=True)
-            self.repeat_thread.start()
-            
-        elif event.direction == 'down':
-            if self.held_direction == 'down' and self.repeat_thread and self.repeat_thread.is_alive():
-                return
-            
-            # Stop any existing repeat
-            self.held_direction = None
-            self.repeat_stop_event.set()
-            if self.repeat_thread and self.repeat_thread.is_alive():
-                self.repeat_thread.join(timeout=0.1)
-            
-            # Immediate change
-            self.decrease_bpm(1.0)
-            
-            # Start repeat thread
-            self.held_direction = 'down'
-            self.repeat_stop_event.clear()
-            self.repeat_thread = threading.Thread(target=self._repeat_bpm_change, args=('down', 1.0), daemon=True)
-            self.repeat_thread.start()
-            
+        step = JOYSTICK_BPM_STEPS.get(event.direction)
+        if step is not None:
+            self._start_repeat(event.direction, step)
         elif event.direction == 'middle':
             # Stop any repeat
-            self.held_direction = None
-            self.repeat_stop_event.set()
-            if self.repeat_thread and self.repeat_thread.is_alive():
-                self.repeat_thread.join(timeout=0.1)
+            self._stop_repeat()
             
             # Toggle start/stop
             if self.running:
                 self.stop_clock()
             else:
                 self.start_clock()
-                
-        elif event.direction == 'left':
-            # Stop any existing repeat and make a single fine decrease
-            self.held_direction = None
-            self.repeat_stop_event.set()
-            if self.repeat_thread and self.repeat_thread.is_alive():
-                self.repeat_thread.join(timeout=0.1)
-            
-            self.decrease_bpm(0.1)
-            
-        elif event.direction == 'right':
-            # Stop any existing repeat and make a single fine increase
-            self.held_direction = None
-            self.repeat_stop_event.set()
-            if self.repeat_thread and self.repeat_thread.is_alive():
-                self.repeat_thread.join(timeout=0.1)
-            
-            self.increase_bpm(0.1)
     
     def run(self):
         """Main run loop."""
@@ -614,20 +815,16 @@ class MIDIClock:
         """Clean up resources."""
         self.stop_clock()
         self.stop_event.set()
-        self.display_stop_event.set()
         
-        # Stop joystick repeat thread
-        self.held_direction = None
-        self.repeat_stop_event.set()
+        # Stop joystick repeat worker (wake it so it sees stop_event)
+        self._stop_repeat()
+        self.repeat_event.set()
         if self.repeat_thread and self.repeat_thread.is_alive():
             self.repeat_thread.join(timeout=0.5)
         
         if self.clock_thread and self.clock_thread.is_alive():
             self.clock_thread.join(timeout=1.0)
         
-        if self.display_thread and self.display_thread.is_alive():
-            self.display_thread.join(timeout=1.0)
-        
         # Close all MIDI ports
         for midiout, port_name in self.midiout_ports:
             try:
@@ -642,6 +839,12 @@ class MIDIClock:
             except (AttributeError, OSError, termios.error):
                 pass
         
+        # Detach the framebuffer first: a late joystick event may still redraw
+        with self.display_lock:
+            fb_map, self._fb_map = self._fb_map, None
+        if fb_map is not None:
+            fb_map.close()
+        
         self.sense.clear()
         print(f"{Colors.BRIGHT_GREEN}✓ Cleanup complete{Colors.RESET}")
 